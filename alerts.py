@@ -0,0 +1,205 @@
+import bisect
+import threading
+import time
+from typing import Dict, Any, List, Optional, Tuple
+
+# Metrics rules can watch, as paths into current weather and forecast items
+METRICS = {
+    'temp': ('main', 'temp'),
+    'humidity': ('main', 'humidity'),
+    'wind': ('wind', 'speed'),
+}
+
+UNITS = {'temp': '°C', 'humidity': '%', 'wind': 'm/s'}
+
+OPERATORS = ('>', '<')
+
+# City value for rules that apply to every favorite city
+ANY_FAVORITE = '*'
+
+
+def _city_key(city: str) -> str:
+    return city.strip().casefold()
+
+
+def _metric_value(data: Dict[str, Any], metric: str) -> Optional[float]:
+    section, field = METRICS[metric]
+    return data.get(section, {}).get(field)
+
+
+class AlertRule:
+    def __init__(self, rule_id: int, city: str, metric: str, op: str,
+                 threshold: float, within_hours: int = 0):
+        self.id = rule_id
+        self.city = city
+        self.metric = metric
+        self.op = op
+        self.threshold = threshold
+        self.within_hours = within_hours
+
+    def describe(self) -> str:
+        place = "any favorite" if self.city == ANY_FAVORITE else self.city
+        text = f"{self.metric} {self.op} {self.threshold:g} {UNITS[self.metric]} in {place}"
+        if self.within_hours:
+            text += f" within {self.within_hours}h"
+        return text
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'id': self.id,
+            'city': self.city,
+            'metric': self.metric,
+            'op': self.op,
+            'threshold': self.threshold,
+            'within_hours': self.within_hours
+        }
+
+
+class AlertEngine:
+    """Threshold rules indexed by city, metric, operator and forecast window.
+
+    Each index bucket keeps its thresholds sorted, so a refresh looks up only
+    the buckets for that city (plus any-favorite rules) and finds the
+    triggered rules with a single bisect per bucket.
+
+    One engine can be shared by every session in a process; hold `lock` to
+    make a reload, change and save of the rules one step.
+    """
+
+    def __init__(self, rules: List[Dict[str, Any]] = None):
+        self.lock = threading.RLock()
+        # Identifies the stored rules the engine was last loaded from
+        self.version = None
+        self.load(rules or [])
+
+    def load(self, rules: List[Dict[str, Any]]):
+        """Replace all rules, e.g. after they changed on disk."""
+        with self.lock:
+            self._rules: Dict[int, AlertRule] = {}
+            self._index: Dict[str, Dict[Tuple[str, str, int], Tuple[List[float], List[AlertRule]]]] = {}
+            self._next_id = 1
+            for data in rules:
+                rule = AlertRule(data['id'], data['city'], data['metric'], data['op'],
+                                 data['threshold'], data.get('within_hours', 0))
+                self._rules[rule.id] = rule
+                self._next_id = max(self._next_id, rule.id + 1)
+                buckets = self._index.setdefault(_city_key(rule.city), {})
+                buckets.setdefault((rule.metric, rule.op, rule.within_hours), ([], []))[1].append(rule)
+
+            # Sort each bucket once instead of inserting rule by rule
+            for buckets in self._index.values():
+                for bucket_key, (_, bucket_rules) in buckets.items():
+                    bucket_rules.sort(key=lambda rule: rule.threshold)
+                    buckets[bucket_key] = ([rule.threshold for rule in bucket_rules], bucket_rules)
+
+    def rules(self) -> List[AlertRule]:
+        with self.lock:
+            return list(self._rules.values())
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        with self.lock:
+            return [rule.to_dict() for rule in self._rules.values()]
+
+    def add_rule(self, city: str, metric: str, op: str, threshold: float,
+                 within_hours: int = 0) -> AlertRule:
+        """Create a rule; use ANY_FAVORITE as city to watch all favorites."""
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric: {metric}")
+        if op not in OPERATORS:
+            raise ValueError(f"Unknown operator: {op}")
+        if within_hours < 0:
+            raise ValueError("Forecast window cannot be negative")
+        city = city.strip()
+        if not city:
+            raise ValueError("City is required")
+
+        with self.lock:
+            rule = AlertRule(self._next_id, city, metric, op, float(threshold), int(within_hours))
+            self._insert(rule)
+        return rule
+
+    def remove_rule(self, rule_id: int) -> bool:
+        with self.lock:
+            return self._remove(rule_id)
+
+    def _remove(self, rule_id: int) -> bool:
+        rule = self._rules.pop(rule_id, None)
+        if rule is None:
+            return False
+
+        buckets = self._index[_city_key(rule.city)]
+        bucket_key = (rule.metric, rule.op, rule.within_hours)
+        thresholds, rules = buckets[bucket_key]
+        position = bisect.bisect_left(thresholds, rule.threshold)
+        while rules[position] is not rule:
+            position += 1
+        del thresholds[position]
+        del rules[position]
+        if not rules:
+            del buckets[bucket_key]
+            if not buckets:
+                del self._index[_city_key(rule.city)]
+        return True
+
+    def _insert(self, rule: AlertRule):
+        self._rules[rule.id] = rule
+        self._next_id = max(self._next_id, rule.id + 1)
+
+        buckets = self._index.setdefault(_city_key(rule.city), {})
+        thresholds, rules = buckets.setdefault((rule.metric, rule.op, rule.within_hours), ([], []))
+        position = bisect.bisect_right(thresholds, rule.threshold)
+        thresholds.insert(position, rule.threshold)
+        rules.insert(position, rule)
+
+    def evaluate(self, city: str, current: Dict[str, Any], forecast: Dict[str, Any] = None,
+                 is_favorite: bool = False) -> List[Dict[str, Any]]:
+        """Return the alerts triggered by fresh data for one city."""
+        with self.lock:
+            return self._evaluate(city, current, forecast, is_favorite)
+
+    def _evaluate(self, city: str, current: Dict[str, Any], forecast: Dict[str, Any],
+                  is_favorite: bool) -> List[Dict[str, Any]]:
+        bucket_groups = []
+        if _city_key(city) in self._index:
+            bucket_groups.append(self._index[_city_key(city)])
+        if is_favorite and ANY_FAVORITE in self._index:
+            bucket_groups.append(self._index[ANY_FAVORITE])
+        if not bucket_groups:
+            return []
+
+        items = (forecast or {}).get('list', [])
+        times = [item['dt'] for item in items]
+        now = time.time()
+        series: Dict[str, List[Optional[float]]] = {}
+        extremes: Dict[Tuple[str, str, int], Optional[float]] = {}
+
+        def extreme(metric: str, op: str, hours: int) -> Optional[float]:
+            key = (metric, op, hours)
+            if key not in extremes:
+                values = [_metric_value(current, metric)]
+                if hours:
+                    if metric not in series:
+                        series[metric] = [_metric_value(item, metric) for item in items]
+                    end = bisect.bisect_right(times, now + hours * 3600)
+                    values.extend(series[metric][:end])
+                values = [value for value in values if value is not None]
+                extremes[key] = (max(values) if op == '>' else min(values)) if values else None
+            return extremes[key]
+
+        alerts = []
+        for buckets in bucket_groups:
+            for (metric, op, hours), (thresholds, rules) in buckets.items():
+                value = extreme(metric, op, hours)
+                if value is None:
+                    continue
+                if op == '>':
+                    triggered = rules[:bisect.bisect_left(thresholds, value)]
+                else:
+                    triggered = rules[bisect.bisect_right(thresholds, value):]
+                for rule in triggered:
+                    alerts.append({
+                        'rule_id': rule.id,
+                        'city': city,
+                        'message': f"{rule.describe()} (observed {value:g} {UNITS[metric]})"
+                    })
+        return alerts
\ No newline at end of file
@@ -3,6 +3,17 @@ import os
 
 class Config:
     API_KEY = os.getenv('OPENWEATHER_API_KEY', 'df70ff280acd3243b2df48b00a2c178a')
-    BASE_URL = 'https://api.openweathermap.org/data/2.5'
+    BASE_URL = os.getenv('OPENWEATHER_BASE_URL', 'https://api.openweathermap.org/data/2.5')
     FAVORITES_FILE = 'data/favorites.json'
-    UNITS = 'metric'  # metric, imperial, or kelvin
\ No newline at end of file
+    ALERTS_FILE = 'data/alerts.json'
+    UNITS = 'metric'  # metric, imperial, or kelvin
+    CACHE_TTL = 600  # seconds a cached API reply stays fresh
+    CACHE_MAX_ENTRIES = 500  # cached API replies kept at most
+    # Optional local gateway that owns all API traffic, e.g. http://127.0.0.1:8600
+    GATEWAY_URL = os.getenv('WEATHER_GATEWAY_URL', '')
+    GATEWAY_HOST = '127.0.0.1'
+    GATEWAY_PORT = 8600
+    GATEWAY_REFRESH_INTERVAL = 60  # seconds between checks for new data
+    GATEWAY_KEEPALIVE = 15  # seconds between keepalive messages on idle streams
+    GATEWAY_UI_REFRESH = 10  # seconds between dashboard checks for pushed data
+    GATEWAY_IDLE_TTL = 300  # seconds a city unused by any dashboard stays subscribed
\ No newline at end of file
@@ -5,8 +5,9 @@ from typing import List, Dict, Any
 from datetime import datetime
 
 class DataManager:
-    def __init__(self, favorites_file: str):
+    def __init__(self, favorites_file: str, alerts_file: str = None):
         self.favorites_file = favorites_file
+        self.alerts_file = alerts_file or os.path.join(os.path.dirname(favorites_file), 'alerts.json')
         self.ensure_data_directory()
     
     def ensure_data_directory(self):
@@ -53,4 +54,40 @@ class DataManager:
             favorites.remove(city)
             self.save_favorites(favorites)
             return True
-        return False
\ No newline at end of file
+        return False
+    
+    def load_alert_rules(self) -> List[Dict[str, Any]]:
+        """Load alert rules from file."""
+        try:
+            if os.path.exists(self.alerts_file):
+                with open(self.alerts_file, 'r') as file:
+                    data = json.load(file)
+                    return data.get('rules', [])
+            return []
+        except (json.JSONDecodeError, FileNotFoundError) as e:
+            print(f"Error loading alert rules: {e}")
+            return []
+    
+    def alert_rules_version(self):
+        """Change marker for the alert rules file, None if it doesn't exist."""
+        try:
+            stat = os.stat(self.alerts_file)
+            return (stat.st_mtime_ns, stat.st_size)
+        except FileNotFoundError:
+            return None
+    
+    def save_alert_rules(self, rules: List[Dict[str, Any]]):
+        """Save alert rules to file."""
+        try:
+            data = {
+                'rules': rules,
+                'last_updated': datetime.now().isoformat()
+            }
+            # Replace the file in one step so other sessions never read it half written
+            temp_file = f"{self.alerts_file}.{os.getpid()}.tmp"
+            # Compact single-call dump: the file can hold tens of thousands of rules
+            with open(temp_file, 'w') as file:
+                file.write(json.dumps(data, separators=(',', ':')))
+            os.replace(temp_file, self.alerts_file)
+        except Exception as e:
+            raise Exception(f"Failed to save alert rules: {str(e)}")
\ No newline at end of file
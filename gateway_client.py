@@ -0,0 +1,119 @@
+import threading
+import time
+import requests
+from typing import Dict, Any, Optional
+from config import Config
+from weather_api import _loads
+
+
+def _city_key(city: str) -> str:
+    return city.strip().casefold()
+
+
+class GatewayWeatherAPI:
+    """Drop-in replacement for WeatherAPI that reads from the weather gateway.
+
+    The first lookup of a city fetches it once over HTTP and opens a
+    server-sent events stream; after that, lookups are served from the
+    latest snapshot the gateway pushed. Once no session has looked at a city
+    for `idle_ttl` seconds its stream is closed and its snapshot dropped, so
+    the gateway stops refreshing it.
+    """
+
+    def __init__(self, gateway_url: str, idle_ttl: float = None):
+        self.gateway_url = gateway_url.rstrip('/')
+        self.idle_ttl = Config.GATEWAY_IDLE_TTL if idle_ttl is None else idle_ttl
+        self._lock = threading.Lock()
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._streams: Dict[str, threading.Thread] = {}
+        self._last_used: Dict[str, float] = {}
+
+    def get_current_weather(self, city: str) -> Dict[str, Any]:
+        try:
+            return self.get_snapshot(city)['weather']
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Failed to fetch weather data: {str(e)}")
+
+    def get_forecast(self, city: str, days: int = 5) -> Dict[str, Any]:
+        try:
+            forecast = self.get_snapshot(city)['forecast']
+        except requests.exceptions.RequestException as e:
+            raise Exception(f"Failed to fetch forecast data: {str(e)}")
+        return {**forecast, 'list': forecast.get('list', [])[:days * 8]}
+
+    def updated_at(self, city: str) -> Optional[float]:
+        """Timestamp of the newest data pushed for a city, if any."""
+        key = _city_key(city)
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot:
+                # A dashboard polling for pushed data is still watching the city
+                self._last_used[key] = time.time()
+        return snapshot['updated'] if snapshot else None
+
+    def get_snapshot(self, city: str) -> Dict[str, Any]:
+        key = _city_key(city)
+        with self._lock:
+            self._last_used[key] = time.time()
+            snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            response = requests.get(f"{self.gateway_url}/weather", params={'city': city}, timeout=15)
+            if response.status_code != 200:
+                raise Exception(_loads(response.content).get('error', f"Gateway returned {response.status_code}"))
+            snapshot = self._store(key, _loads(response.content))
+        self._ensure_stream(city)
+        return snapshot
+
+    def _store(self, key: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        with self._lock:
+            current = self._snapshots.get(key)
+            if current is None or snapshot['updated'] >= current['updated']:
+                self._snapshots[key] = snapshot
+            return self._snapshots[key]
+
+    def _ensure_stream(self, city: str):
+        key = _city_key(city)
+        with self._lock:
+            if key in self._streams:
+                return
+            thread = threading.Thread(target=self._listen, args=(city,), daemon=True)
+            self._streams[key] = thread
+        thread.start()
+
+    def _listen(self, city: str):
+        """Follow the gateway's event stream for a city, reconnecting on errors."""
+        key = _city_key(city)
+        delay = 1
+        while not self._release_if_idle(key):
+            try:
+                with requests.get(f"{self.gateway_url}/subscribe", params={'city': city},
+                                  stream=True, timeout=(5, 60)) as response:
+                    response.raise_for_status()
+                    delay = 1
+                    data = []
+                    # The gateway sends at least a keepalive every few seconds,
+                    # so idleness is noticed even when the weather doesn't change.
+                    # Each event is one HTTP chunk, so read chunk by chunk rather
+                    # than waiting for a fixed number of (decompressed) bytes.
+                    for line in response.iter_lines(chunk_size=None):
+                        if self._release_if_idle(key):
+                            return
+                        if line.startswith(b'data:'):
+                            data.append(line[5:].strip())
+                        elif not line and data:
+                            self._store(key, _loads(b''.join(data)))
+                            data = []
+            except (requests.exceptions.RequestException, ValueError) as e:
+                print(f"Gateway stream for {city} interrupted: {e}")
+            time.sleep(delay)
+            delay = min(delay * 2, 60)
+
+    def _release_if_idle(self, key: str) -> bool:
+        """Forget a city nobody has used lately; True if it was released."""
+        with self._lock:
+            if time.time() - self._last_used.get(key, 0) < self.idle_ttl:
+                return False
+            self._streams.pop(key, None)
+            self._snapshots.pop(key, None)
+            self._last_used.pop(key, None)
+            return True
\ No newline at end of file
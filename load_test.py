@@ -0,0 +1,422 @@
+"""Concurrent-session load test for the Streamlit dashboard.
+
+Runs many headless sessions of streamlit_app.py in this process with
+Streamlit's AppTest, each following a scripted flow (search, forecast,
+favorites, page navigation), against a mock OpenWeatherMap server running
+in a separate process. Concurrency is ramped up step by step and each step
+reports rerun latency percentiles per interaction, CPU and RSS of this
+process, upstream request counts and throughput. The saturation point is
+the first step where throughput stops growing or p95 latency exceeds the
+limit.
+
+CPU and RSS cover the dashboard sessions plus AppTest's own bookkeeping,
+which runs alongside the scripts, so they slightly overstate a real server.
+The harness relies on Streamlit internals; see prepare_concurrent_sessions.
+Its pinned dependencies are in requirements-loadtest.txt.
+
+    pip install -r requirements-loadtest.txt
+    python load_test.py --max-sessions 32 --iterations 3
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter, defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, List
+from urllib.parse import urlparse, parse_qs
+from urllib.request import urlopen
+
+import psutil
+
+from config import Config
+
+# Streamlit release the runtime patches below were written against
+TESTED_STREAMLIT_VERSION = '1.66.0'
+
+CITIES = ['London', 'Paris', 'Berlin', 'Tokyo', 'Sydney', 'Mumbai', 'New York', 'Cairo',
+          'Toronto', 'Madrid', 'Rome', 'Oslo', 'Lima', 'Seoul', 'Nairobi', 'Dublin']
+
+
+class MockOWMHandler(BaseHTTPRequestHandler):
+    """Serves gzip-compressed synthetic OWM replies and counts requests."""
+    counts: Counter = Counter()
+    lock = threading.Lock()
+    latency = 0.0
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        city = parse_qs(url.query).get('q', ['Unknown'])[0]
+        endpoint = url.path.rsplit('/', 1)[-1]
+
+        if endpoint in ('_stats', '_reset'):
+            with self.lock:
+                data = dict(self.counts)
+                if endpoint == '_reset':
+                    self.counts.clear()
+            body = json.dumps(data).encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        with self.lock:
+            self.counts[endpoint] += 1
+
+        if endpoint == 'weather':
+            data = self.current_weather(city)
+        elif endpoint == 'forecast':
+            data = self.forecast(city, int(parse_qs(url.query).get('cnt', ['40'])[0]))
+        else:
+            self.send_error(404)
+            return
+
+        if self.latency:
+            time.sleep(self.latency)
+        body = gzip.compress(json.dumps(data).encode('utf-8'))
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Encoding', 'gzip')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    @staticmethod
+    def current_weather(city: str) -> Dict[str, Any]:
+        now = int(time.time())
+        seed = random.Random(city)
+        return {
+            'name': city,
+            'coord': {'lat': seed.uniform(-60, 60), 'lon': seed.uniform(-180, 180)},
+            'sys': {'country': 'XX', 'sunrise': now - 20000, 'sunset': now + 20000},
+            'weather': [{'id': 800, 'main': 'Clear', 'description': 'clear sky', 'icon': '01d'}],
+            'main': {'temp': seed.uniform(-10, 35), 'feels_like': seed.uniform(-12, 35),
+                     'humidity': seed.randint(20, 100), 'pressure': seed.randint(980, 1040)},
+            'wind': {'speed': seed.uniform(0, 20), 'deg': seed.randint(0, 359)},
+            'clouds': {'all': seed.randint(0, 100)},
+            'visibility': 10000,
+            'dt': now
+        }
+
+    @staticmethod
+    def forecast(city: str, count: int) -> Dict[str, Any]:
+        start = int(time.time()) // 10800 * 10800
+        seed = random.Random(city)
+        return {
+            'city': {'name': city, 'country': 'XX'},
+            'list': [{
+                'dt': start + i * 10800,
+                'main': {'temp': seed.uniform(-10, 35), 'humidity': seed.randint(20, 100)},
+                'weather': [{'description': seed.choice(['clear sky', 'light rain', 'few clouds'])}],
+                'wind': {'speed': seed.uniform(0, 20)}
+            } for i in range(count)]
+        }
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_mock(latency: float):
+    """Run the mock server until terminated, announcing its port on stdout."""
+    MockOWMHandler.latency = latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockOWMHandler)
+    server.daemon_threads = True
+    print(server.server_address[1], flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+class MockOWMProcess:
+    """The mock server in a child process, so its work isn't measured."""
+
+    def __init__(self, latency: float):
+        self.process = subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), '--serve-mock', '--upstream-latency', str(latency)],
+            stdout=subprocess.PIPE, text=True
+        )
+        self.url = f"http://127.0.0.1:{int(self.process.stdout.readline())}"
+
+    def reset_counts(self) -> Dict[str, int]:
+        with urlopen(f"{self.url}/_reset") as response:
+            return json.load(response)
+
+    def stop(self):
+        self.process.terminate()
+        self.process.wait()
+
+
+class ResourceSampler:
+    """Samples CPU and RSS of this process in the background."""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self.rss_samples: List[int] = []
+        self._stopped = threading.Event()
+        self._process = psutil.Process()
+
+    def rss(self) -> int:
+        return self._process.memory_info().rss
+
+    def __enter__(self):
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stopped.set()
+        self._thread.join()
+        self.cpu_seconds = time.process_time() - self.cpu_start
+        self.wall_seconds = time.perf_counter() - self.wall_start
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            self.rss_samples.append(self.rss())
+
+
+def prepare_concurrent_sessions():
+    """Let AppTest sessions overlap in one process, like a Streamlit server.
+
+    AppTest installs a mock Runtime singleton before each run and clears it
+    afterwards, so a session finishing would pull the runtime out from under
+    sessions still running; keep the last installed one visible instead.
+    It also compiles the script on every run, while a server compiles it once
+    and shares the bytecode, so share it here too.
+
+    These are private Streamlit APIs, so check they still look as expected
+    before replacing them for the whole process.
+    """
+    import streamlit
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.scriptrunner.script_cache import ScriptCache
+
+    if streamlit.__version__ != TESTED_STREAMLIT_VERSION:
+        print(f"Warning: harness written for Streamlit {TESTED_STREAMLIT_VERSION}, "
+              f"found {streamlit.__version__}; results may be skewed")
+    for owner, name in ((Runtime, '_instance'), (Runtime, 'instance'), (Runtime, 'exists'),
+                        (ScriptCache, 'get_bytecode')):
+        if not hasattr(owner, name):
+            raise RuntimeError(f"Streamlit {streamlit.__version__} has no {owner.__name__}.{name}; "
+                               f"the load test needs Streamlit {TESTED_STREAMLIT_VERSION}")
+
+    installed = {}
+
+    def instance(cls):
+        if cls._instance is not None:
+            installed['runtime'] = cls._instance
+        if 'runtime' not in installed:
+            raise RuntimeError("Runtime hasn't been created!")
+        return installed['runtime']
+
+    Runtime.instance = classmethod(instance)
+    Runtime.exists = classmethod(lambda cls: cls._instance is not None or 'runtime' in installed)
+
+    compile_lock = threading.Lock()
+    bytecode = {}
+    get_bytecode = ScriptCache.get_bytecode
+
+    def shared_bytecode(self, script_path):
+        with compile_lock:
+            if script_path not in bytecode:
+                bytecode[script_path] = get_bytecode(self, script_path)
+            return bytecode[script_path]
+
+    ScriptCache.get_bytecode = shared_bytecode
+
+
+def find_widget(widgets, label: str):
+    for widget in widgets:
+        if widget.label == label:
+            return widget
+    raise LookupError(f"No widget labelled {label!r}")
+
+
+def run_session(session_id: int, iterations: int, latencies: Dict[str, List[float]],
+                errors: List[str], lock: threading.Lock):
+    """Drive one headless dashboard session through the scripted flow."""
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(session_id)
+    at = AppTest.from_file('streamlit_app.py', default_timeout=60)
+
+    def step(name: str, action, expect: str = None):
+        """Time one interaction; it only counts if the app reports success.
+
+        The app catches its own failures and shows them with st.error, so a
+        run without an exception can still be a failed interaction.
+        """
+        start = time.perf_counter()
+        try:
+            action()
+            at.run()
+            elapsed = time.perf_counter() - start
+            if at.exception:
+                raise RuntimeError(at.exception[0].message)
+            if at.error:
+                raise RuntimeError(at.error[0].value)
+            if expect and not any(expect in message.value for message in at.success):
+                raise RuntimeError(f"expected {expect!r}")
+        except Exception as e:
+            with lock:
+                errors.append(f"session {session_id} {name}: {e}")
+            return
+        with lock:
+            latencies[name].append(elapsed)
+
+    def navigate(page: str):
+        step(f"open {page}", lambda: at.sidebar.radio[0].set_value(page))
+
+    step('initial load', lambda: None)
+    for _ in range(iterations):
+        city = rng.choice(CITIES)
+        favorite = f"{rng.choice(CITIES)} {session_id}"
+
+        navigate('Current Weather')
+        step('search', lambda: (at.sidebar.text_input[0].input(city),
+                                at.sidebar.button(key='quick_search_btn').click()),
+             expect=f"Weather data loaded for {city}")
+        navigate('5-Day Forecast')
+        step('open forecast', lambda: find_widget(at.button, 'Get 5-Day Forecast').click(),
+             expect=f"5-day forecast loaded for {city}")
+        navigate('Favorites')
+        step('add favorite', lambda: (find_widget(at.text_input, 'Add city to favorites:').input(favorite),
+                                      find_widget(at.button, 'Add to Favorites').click()),
+             expect=f"{favorite} added to favorites!")
+        step('select favorite', lambda: at.multiselect(key='cities_to_remove').select(favorite))
+        step('remove favorite', lambda: find_widget(at.button, 'Remove Selected').click())
+        navigate('Alerts')
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def run_level(sessions: int, iterations: int, mock: MockOWMProcess) -> Dict[str, Any]:
+    latencies: Dict[str, List[float]] = defaultdict(list)
+    errors: List[str] = []
+    lock = threading.Lock()
+    mock.reset_counts()
+
+    threads = [threading.Thread(target=run_session, args=(i, iterations, latencies, errors, lock))
+               for i in range(sessions)]
+    with ResourceSampler() as sampler:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    all_latencies = [value for values in latencies.values() for value in values]
+    return {
+        'sessions': sessions,
+        'interactions': len(all_latencies),
+        'errors': errors,
+        'throughput': len(all_latencies) / sampler.wall_seconds,
+        'p50': percentile(all_latencies, 50) if all_latencies else 0.0,
+        'p95': percentile(all_latencies, 95) if all_latencies else 0.0,
+        'p99': percentile(all_latencies, 99) if all_latencies else 0.0,
+        'by_interaction': {
+            name: {'count': len(values), 'p50': percentile(values, 50),
+                   'p95': percentile(values, 95), 'p99': percentile(values, 99)}
+            for name, values in sorted(latencies.items())
+        },
+        'cpu_cores': sampler.cpu_seconds / sampler.wall_seconds,
+        'rss_peak_mb': max(sampler.rss_samples or [sampler.rss()]) / 1024 / 1024,
+        'upstream_requests': mock.reset_counts(),
+        'wall_seconds': sampler.wall_seconds
+    }
+
+
+def print_level(result: Dict[str, Any]):
+    upstream = sum(result['upstream_requests'].values())
+    print(f"\n{result['sessions']} sessions: {result['interactions']} interactions in "
+          f"{result['wall_seconds']:.1f}s ({result['throughput']:.1f}/s), "
+          f"CPU {result['cpu_cores']:.2f} cores, RSS peak {result['rss_peak_mb']:.0f} MB, "
+          f"upstream requests {upstream}, errors {len(result['errors'])}")
+    print(f"  {'interaction':<22}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, stats in result['by_interaction'].items():
+        print(f"  {name:<22}{stats['count']:>7}{stats['p50'] * 1000:>10.0f}"
+              f"{stats['p95'] * 1000:>10.0f}{stats['p99'] * 1000:>10.0f}")
+    for error in result['errors'][:5]:
+        print(f"  error: {error}")
+
+
+def find_saturation(results: List[Dict[str, Any]], p95_limit: float, min_gain: float):
+    """First level where p95 breaks the limit or throughput stops growing."""
+    for previous, current in zip([None] + results, results):
+        if current['p95'] > p95_limit:
+            return current['sessions'], f"p95 {current['p95'] * 1000:.0f} ms exceeds {p95_limit * 1000:.0f} ms"
+        if previous and current['throughput'] < previous['throughput'] * (1 + min_gain):
+            return current['sessions'], (f"throughput {current['throughput']:.1f}/s vs "
+                                         f"{previous['throughput']:.1f}/s at {previous['sessions']} sessions")
+    return None, "not reached"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load test the Streamlit weather dashboard")
+    parser.add_argument('--start-sessions', type=int, default=1)
+    parser.add_argument('--max-sessions', type=int, default=32)
+    parser.add_argument('--iterations', type=int, default=3, help="flow repetitions per session")
+    parser.add_argument('--upstream-latency', type=float, default=0.05, help="mock OWM delay in seconds")
+    parser.add_argument('--p95-limit', type=float, default=1.0, help="p95 rerun latency limit in seconds")
+    parser.add_argument('--min-gain', type=float, default=0.1, help="throughput growth expected per step")
+    parser.add_argument('--json', help="write full results to this file")
+    parser.add_argument('--serve-mock', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve_mock:
+        serve_mock(args.upstream_latency)
+        return 0
+    if args.start_sessions < 1 or args.max_sessions < 1 or args.iterations < 1:
+        parser.error("--start-sessions, --max-sessions and --iterations must be at least 1")
+    if args.start_sessions > args.max_sessions:
+        parser.error("--start-sessions cannot be greater than --max-sessions")
+
+    os.environ.setdefault('STREAMLIT_LOGGER_LEVEL', 'error')
+    prepare_concurrent_sessions()
+    mock = MockOWMProcess(args.upstream_latency)
+
+    # Sessions run in this process, so point the app at the mock and a scratch data dir
+    data_dir = tempfile.mkdtemp(prefix='weather_load_test_')
+    Config.BASE_URL = mock.url
+    Config.FAVORITES_FILE = os.path.join(data_dir, 'favorites.json')
+    Config.ALERTS_FILE = os.path.join(data_dir, 'alerts.json')
+    Config.GATEWAY_URL = ''
+    print(f"Mock OpenWeatherMap at {Config.BASE_URL}, data in {data_dir}")
+
+    results = []
+    sessions = args.start_sessions
+    try:
+        # Load the app once unmeasured so the first level doesn't pay for cold imports
+        run_session(-1, 0, defaultdict(list), [], threading.Lock())
+        while sessions <= args.max_sessions:
+            result = run_level(sessions, args.iterations, mock)
+            print_level(result)
+            results.append(result)
+            sessions *= 2
+    finally:
+        mock.stop()
+
+    saturation, reason = find_saturation(results, args.p95_limit, args.min_gain)
+    print(f"\nSaturation point: {saturation or 'above ' + str(results[-1]['sessions'])} sessions ({reason})")
+
+    if args.json:
+        with open(args.json, 'w') as file:
+            json.dump({'results': results, 'saturation': saturation, 'reason': reason}, file, indent=2)
+
+    return 0 if not any(result['errors'] for result in results) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
\ No newline at end of file
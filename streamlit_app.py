@@ -7,6 +7,10 @@ import time
 
 
 from weather_app import WeatherApp
+from weather_api import WeatherAPI
+from gateway_client import GatewayWeatherAPI
+from config import Config
+from alerts import AlertEngine, METRICS, OPERATORS, ANY_FAVORITE
 
 
 st.set_page_config(
@@ -61,8 +65,19 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+@st.cache_resource
+def get_weather_source():
+    # One gateway client per server process, shared by every session
+    return GatewayWeatherAPI(Config.GATEWAY_URL)
+
+@st.cache_resource
+def get_alert_engine():
+    # One rule index per server process; sessions reload it when the file changes
+    return AlertEngine()
+
 if 'weather_app' not in st.session_state:
-    st.session_state.weather_app = WeatherApp()
+    st.session_state.weather_app = WeatherApp(get_weather_source() if Config.GATEWAY_URL else WeatherAPI(),
+                                              get_alert_engine())
     st.session_state.search_history = []
     st.session_state.current_city = None
     st.session_state.last_search_time = None
@@ -74,9 +89,11 @@ def main():
         st.header("Navigation")
         page = st.radio(
             "Choose a section:",
-            ["Current Weather", "5-Day Forecast", "Favorites"]
+            ["Current Weather", "5-Day Forecast", "Favorites", "Alerts"]
         )
         
+        show_alert_count()
+        
         st.markdown("---")
         
         
@@ -103,6 +120,7 @@ def main():
             - 5-day forecast
             - Interactive charts
             - Favorite cities 
+            - Weather alerts
             - Global data
             
             Data used from OpenWeatherMap API
@@ -115,6 +133,8 @@ def main():
         show_forecast()
     elif page == "Favorites":
         show_favorites()
+    elif page == "Alerts":
+        show_alerts()
 
 def search_weather(city):
     st.session_state.current_city = city
@@ -164,8 +184,28 @@ def show_current_weather():
     else:
         st.info("Welcome! Enter city name to get started")
 
+def live_section(func):
+    """Rerun a section on a timer so data pushed by the gateway shows up."""
+    if Config.GATEWAY_URL and hasattr(st, 'fragment'):
+        return st.fragment(run_every=Config.GATEWAY_UI_REFRESH)(func)
+    return func
+
+def sync_pushed_data():
+    if st.session_state.weather_app.sync_pushed_update():
+        st.session_state.last_search_time = datetime.now()
+
+@live_section
+def show_alert_count():
+    sync_pushed_data()
+    alert_count = sum(len(alerts) for alerts in st.session_state.weather_app.triggered_alerts.values())
+    if alert_count:
+        st.warning(f"{alert_count} active weather alerts")
+
+@live_section
 def display_current_weather_data():
     try:
+        sync_pushed_data()
+        
         data = st.session_state.weather_app.current_weather
         
         col1, col2 = st.columns([3, 1])
@@ -179,6 +219,9 @@ def display_current_weather_data():
         
         st.markdown('<div class="data-source">OpenWeatherMap</div>', unsafe_allow_html=True)
         
+        for alert in st.session_state.weather_app.triggered_alerts.get(st.session_state.weather_app.current_city, []):
+            st.warning(f"Alert: {alert['message']}")
+        
         
         weather_desc = data['weather'][0]['description'].title()
         st.markdown(f'<p class="weather-description">{weather_desc}</p>', unsafe_allow_html=True)
@@ -471,5 +514,65 @@ def show_favorites():
         st.info("No favorite cities yet.")
         st.write("Add cities above to save them as favorites for quick access!")
 
+def show_alerts():
+    st.header("Weather Alerts")
+    
+    col1, col2, col3, col4, col5 = st.columns([2, 1, 1, 1, 1])
+    
+    with col1:
+        favorites = st.session_state.weather_app.get_favorites()
+        scope = st.selectbox("City:", ["Any favorite"] + favorites + ["Other city"])
+        if scope == "Other city":
+            alert_city = st.text_input("City name:", key="alert_city")
+        else:
+            alert_city = ANY_FAVORITE if scope == "Any favorite" else scope
+    
+    with col2:
+        metric = st.selectbox("Metric:", list(METRICS))
+    
+    with col3:
+        op = st.selectbox("Condition:", list(OPERATORS))
+    
+    with col4:
+        threshold = st.number_input("Threshold:", value=0.0, step=1.0)
+    
+    with col5:
+        within_hours = st.number_input("Within hours:", min_value=0, max_value=120, value=0, step=3,
+                                       help="0 checks current weather only")
+    
+    if st.button("Add Alert Rule", type="primary"):
+        try:
+            rule = st.session_state.weather_app.add_alert_rule(alert_city or "", metric, op, threshold, within_hours)
+            st.success(f"Alert added: {rule.describe()}")
+        except ValueError as e:
+            st.error(f"Cannot add alert: {str(e)}")
+    
+    triggered = st.session_state.weather_app.triggered_alerts
+    if triggered:
+        st.subheader("Active Alerts")
+        for city, alerts in triggered.items():
+            for alert in alerts:
+                st.warning(f"**{city}:** {alert['message']}")
+    
+    rules = st.session_state.weather_app.alert_engine.rules()
+    
+    if rules:
+        st.subheader(f"Your Alert Rules ({len(rules)} rules)")
+        
+        for rule in rules:
+            col1, col2 = st.columns([4, 1])
+            
+            with col1:
+                st.write(rule.describe())
+            
+            with col2:
+                if st.button("Remove", key=f"remove_alert_{rule.id}"):
+                    st.session_state.weather_app.remove_alert_rule(rule.id)
+                    st.rerun()
+    
+    else:
+        st.info("No alert rules yet.")
+        st.write("Rules are checked every time weather for a city is refreshed.")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -1,44 +1,136 @@
+import gzip
+import json
+import threading
+import time
 import requests
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from config import Config
 
+try:
+    import orjson
+    _loads = orjson.loads
+    _dumps = orjson.dumps
+except ImportError:
+    _loads = json.loads
+
+    def _dumps(data: Any) -> bytes:
+        return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+
+# Fields the dashboard actually reads. None keeps a leaf value, a nested dict
+# keeps a sub-object and a one-element list projects every item of an array.
+CURRENT_WEATHER_FIELDS = {
+    'name': None,
+    'coord': {'lat': None, 'lon': None},
+    'sys': {'country': None, 'sunrise': None, 'sunset': None},
+    'weather': [{'description': None}],
+    'main': {'temp': None, 'feels_like': None, 'humidity': None, 'pressure': None},
+    'wind': {'speed': None, 'deg': None},
+    'clouds': {'all': None},
+    'visibility': None,
+}
+
+FORECAST_FIELDS = {
+    'city': {'name': None, 'country': None},
+    'list': [{
+        'dt': None,
+        'main': {'temp': None, 'humidity': None},
+        'weather': [{'description': None}],
+        'wind': {'speed': None},
+    }],
+}
+
+
+def project(data: Any, fields: Any) -> Any:
+    """Keep only the parts of decoded JSON described by a field spec."""
+    if fields is None:
+        return data
+    if isinstance(fields, list):
+        if not isinstance(data, list):
+            return data
+        return [project(item, fields[0]) for item in data]
+    if not isinstance(data, dict):
+        return data
+    return {key: project(data[key], sub) for key, sub in fields.items() if key in data}
+
+
+class WeatherResponse:
+    """A reply kept as gzip-compressed bytes and decoded only on demand."""
+
+    def __init__(self, body: bytes, fetched_at: float):
+        self.body = body
+        self.fetched_at = fetched_at
+
+    def decode(self, fields: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Decompress and parse the body, projected to the given fields."""
+        return project(_loads(gzip.decompress(self.body)), fields)
+
+
 class WeatherAPI:
     def __init__(self):
         self.config = Config()
-    
+        self.session = requests.Session()
+        self.session.headers['Accept-Encoding'] = 'gzip'
+        self._cache: Dict[Tuple[str, str, int], WeatherResponse] = {}
+        self._cache_lock = threading.Lock()
+
+    def fetch_raw(self, endpoint: str, city: str, count: int = 0) -> WeatherResponse:
+        """Return the compressed reply for an endpoint, from cache if still fresh."""
+        key = (endpoint, city.strip().lower(), count)
+        with self._cache_lock:
+            cached = self._cache.pop(key, None)
+            if cached and time.time() - cached.fetched_at < self.config.CACHE_TTL:
+                self._cache[key] = cached
+                return cached
+
+        params = {
+            'q': city,
+            'appid': self.config.API_KEY,
+            'units': self.config.UNITS
+        }
+        if count:
+            params['cnt'] = count
+
+        with self.session.get(f"{self.config.BASE_URL}/{endpoint}",
+                              params=params, timeout=10, stream=True) as response:
+            response.raise_for_status()
+
+            # Read the body as it came over the wire so gzip replies stay compressed
+            body = response.raw.read(decode_content=False)
+            if response.headers.get('Content-Encoding', '').lower() != 'gzip':
+                body = gzip.compress(body, compresslevel=1)
+
+        cached = WeatherResponse(body, time.time())
+        with self._cache_lock:
+            self._cache[key] = cached
+            self._evict()
+        return cached
+
+    def _evict(self):
+        """Drop expired replies, then the least recently used ones over the cap.
+
+        Must be called with the cache lock held.
+        """
+        now = time.time()
+        for key in [key for key, cached in self._cache.items()
+                    if now - cached.fetched_at >= self.config.CACHE_TTL]:
+            del self._cache[key]
+        # Hits are re-inserted, so dict order runs from least to most recently used
+        while len(self._cache) > self.config.CACHE_MAX_ENTRIES:
+            del self._cache[next(iter(self._cache))]
+
     def get_current_weather(self, city: str) -> Dict[str, Any]:
         try:
-            url = f"{self.config.BASE_URL}/weather"
-            params = {
-                'q': city,
-                'appid': self.config.API_KEY,
-                'units': self.config.UNITS
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            return response.json()
-            
+            return self.fetch_raw('weather', city).decode(CURRENT_WEATHER_FIELDS)
+
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to fetch weather data: {str(e)}")
         except Exception as e:
             raise Exception(f"Error processing weather data: {str(e)}")
-    
+
     def get_forecast(self, city: str, days: int = 5) -> Dict[str, Any]:
         try:
-            url = f"{self.config.BASE_URL}/forecast"
-            params = {
-                'q': city,
-                'appid': self.config.API_KEY,
-                'units': self.config.UNITS,
-                'cnt': days * 8  
-            }
-            
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            return response.json()
-            
+            return self.fetch_raw('forecast', city, days * 8).decode(FORECAST_FIELDS)
+
         except requests.exceptions.RequestException as e:
             raise Exception(f"Failed to fetch forecast data: {str(e)}")
\ No newline at end of file
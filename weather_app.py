@@ -1,23 +1,106 @@
 from weather_api import WeatherAPI
 from data_manager import DataManager
 from config import Config
+from alerts import AlertEngine
 
 class WeatherApp:
-    def __init__(self):
-        self.weather_api = WeatherAPI()
-        self.data_manager = DataManager(Config.FAVORITES_FILE)
+    def __init__(self, weather_api=None, alert_engine: AlertEngine = None):
+        self.weather_api = weather_api or WeatherAPI()
+        self.data_manager = DataManager(Config.FAVORITES_FILE, Config.ALERTS_FILE)
+        self.alert_engine = alert_engine or AlertEngine()
         self.current_city = None
         self.current_weather = None
         self.forecast_data = None
+        self.triggered_alerts = {}
+        self.data_version = None
     
     def search_city(self, city: str):
         try:
             self.current_weather = self.weather_api.get_current_weather(city)
             self.forecast_data = self.weather_api.get_forecast(city)
             self.current_city = city
-            return True
+            self.data_version = self.get_data_version(city)
         except Exception as e:
             raise Exception(f"Failed to get weather for {city}: {str(e)}")
+        
+        self.check_alerts(city)
+        return True
+    
+    def get_data_version(self, city: str):
+        updated_at = getattr(self.weather_api, 'updated_at', None)
+        return updated_at(city) if updated_at else None
+    
+    def sync_pushed_update(self) -> bool:
+        """Reload the current city if the gateway pushed newer data for it.
+
+        Runs on a timer, so failures keep the data already shown and are
+        retried on the next tick instead of being raised.
+        """
+        if not self.current_city:
+            return False
+        version = self.get_data_version(self.current_city)
+        if version is None or version == self.data_version:
+            return False
+        try:
+            self.search_city(self.current_city)
+        except Exception as e:
+            print(f"Error loading pushed update for {self.current_city}: {e}")
+            return False
+        return True
+    
+    def check_alerts(self, city: str):
+        """Evaluate alert rules against the latest data for a city."""
+        self.sync_alert_rules()
+        favorites = {favorite.strip().casefold() for favorite in self.get_favorites()}
+        alerts = self.alert_engine.evaluate(
+            city, self.current_weather, self.forecast_data,
+            is_favorite=city.strip().casefold() in favorites
+        )
+        if alerts:
+            self.triggered_alerts[city] = alerts
+        else:
+            self.triggered_alerts.pop(city, None)
+        return alerts
+    
+    def sync_alert_rules(self):
+        """Reload alert rules if another session or process changed the file."""
+        with self.alert_engine.lock:
+            version = self.data_manager.alert_rules_version()
+            if version != self.alert_engine.version:
+                self.alert_engine.load(self.data_manager.load_alert_rules())
+                self.alert_engine.version = version
+    
+    def save_alert_rules(self):
+        self.data_manager.save_alert_rules(self.alert_engine.to_list())
+        self.alert_engine.version = self.data_manager.alert_rules_version()
+    
+    def add_alert_rule(self, city: str, metric: str, op: str, threshold: float, within_hours: int = 0):
+        # Pick up outside changes first so the new rule is numbered after the saved ones
+        with self.alert_engine.lock:
+            self.sync_alert_rules()
+            rule = self.alert_engine.add_rule(city, metric, op, threshold, within_hours)
+            self.save_alert_rules()
+        self.recheck_alerts()
+        return rule
+    
+    def remove_alert_rule(self, rule_id: int):
+        with self.alert_engine.lock:
+            self.sync_alert_rules()
+            removed = self.alert_engine.remove_rule(rule_id)
+            if removed:
+                self.save_alert_rules()
+        for city in list(self.triggered_alerts):
+            alerts = [alert for alert in self.triggered_alerts[city] if alert['rule_id'] != rule_id]
+            if alerts:
+                self.triggered_alerts[city] = alerts
+            else:
+                del self.triggered_alerts[city]
+        return removed
+    
+    def recheck_alerts(self):
+        """Evaluate the rules against the data already loaded for the current city."""
+        if self.current_city and self.current_weather:
+            self.check_alerts(self.current_city)
     
     def add_to_favorites(self, city: str = None):
         city = city or self.current_city
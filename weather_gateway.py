@@ -0,0 +1,234 @@
+import gzip
+import json
+import queue
+import threading
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Any, Set
+from urllib.parse import urlparse, parse_qs
+
+from weather_api import WeatherAPI, CURRENT_WEATHER_FIELDS, FORECAST_FIELDS, _dumps
+from config import Config
+
+
+def _city_key(city: str) -> str:
+    return city.strip().casefold()
+
+
+class WeatherGateway:
+    """Owns all OpenWeatherMap traffic and fans updates out to subscribers.
+
+    Every subscribed city is fetched once per refresh, however many
+    dashboards are watching it, and each new reply is pushed to all of them.
+    """
+
+    def __init__(self):
+        self.weather_api = WeatherAPI()
+        self._lock = threading.Lock()
+        self._city_locks: Dict[str, threading.Lock] = {}
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._subscribers: Dict[str, Set[queue.Queue]] = {}
+        self._stopped = threading.Event()
+
+    def get_snapshot(self, city: str) -> Dict[str, Any]:
+        """Return current data for a city; the API cache keeps this cheap."""
+        return self.refresh(city)
+
+    def refresh(self, city: str) -> Dict[str, Any]:
+        """Fetch a city and push it to subscribers if upstream data changed.
+
+        Snapshots are only kept for cities somebody is subscribed to.
+        """
+        key = _city_key(city)
+        with self._lock:
+            city_lock = self._city_locks.setdefault(key, threading.Lock())
+
+        with city_lock:
+            weather = self.weather_api.fetch_raw('weather', city)
+            forecast = self.weather_api.fetch_raw('forecast', city, 40)
+            version = max(weather.fetched_at, forecast.fetched_at)
+
+            snapshot = self._snapshots.get(key)
+            if snapshot and snapshot['updated'] == version:
+                return snapshot
+
+            snapshot = {
+                'city': city,
+                'updated': version,
+                'weather': weather.decode(CURRENT_WEATHER_FIELDS),
+                'forecast': forecast.decode(FORECAST_FIELDS)
+            }
+            snapshot['payload'] = _dumps(
+                {name: snapshot[name] for name in ('city', 'updated', 'weather', 'forecast')}
+            )
+            snapshot['payload_gzip'] = gzip.compress(snapshot['payload'], compresslevel=6)
+            with self._lock:
+                if key in self._subscribers:
+                    self._snapshots[key] = snapshot
+
+        self.publish(key, snapshot)
+        return snapshot
+
+    def subscribe(self, city: str) -> queue.Queue:
+        updates = queue.Queue(maxsize=8)
+        with self._lock:
+            self._subscribers.setdefault(_city_key(city), set()).add(updates)
+        return updates
+
+    def unsubscribe(self, city: str, updates: queue.Queue):
+        key = _city_key(city)
+        with self._lock:
+            subscribers = self._subscribers.get(key, set())
+            subscribers.discard(updates)
+            if not subscribers:
+                self._subscribers.pop(key, None)
+                self._snapshots.pop(key, None)
+                self._city_locks.pop(key, None)
+
+    def publish(self, key: str, snapshot: Dict[str, Any]):
+        with self._lock:
+            subscribers = list(self._subscribers.get(key, ()))
+        for updates in subscribers:
+            try:
+                updates.put_nowait(snapshot)
+            except queue.Full:
+                # A slow dashboard only needs the newest data, drop its backlog
+                try:
+                    updates.get_nowait()
+                except queue.Empty:
+                    pass
+                updates.put_nowait(snapshot)
+
+    def run_scheduler(self):
+        """Refresh every watched city until stop() is called."""
+        while not self._stopped.wait(Config.GATEWAY_REFRESH_INTERVAL):
+            with self._lock:
+                cities = [self._snapshots[key]['city'] for key in self._subscribers if key in self._snapshots]
+            for city in cities:
+                try:
+                    self.refresh(city)
+                except Exception as e:
+                    print(f"Error refreshing {city}: {e}")
+
+    def stop(self):
+        self._stopped.set()
+
+
+class GatewayRequestHandler(BaseHTTPRequestHandler):
+    gateway: WeatherGateway = None
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        city = parse_qs(url.query).get('city', [''])[0].strip()
+
+        if url.path not in ('/weather', '/subscribe'):
+            self.send_json(404, {'error': 'Not found'})
+            return
+        if not city:
+            self.send_json(400, {'error': 'Missing city parameter'})
+            return
+
+        # Subscribe before reading the snapshot so no update can slip between them
+        updates = self.gateway.subscribe(city) if url.path == '/subscribe' else None
+        try:
+            snapshot = self.gateway.get_snapshot(city)
+        except Exception as e:
+            if updates:
+                self.gateway.unsubscribe(city, updates)
+            self.send_json(502, {'error': str(e)})
+            return
+
+        if updates:
+            self.stream_updates(city, snapshot, updates)
+        elif self.accepts_gzip():
+            self.send_body(200, 'application/json', snapshot['payload_gzip'], 'gzip')
+        else:
+            self.send_body(200, 'application/json', snapshot['payload'])
+
+    def accepts_gzip(self) -> bool:
+        return 'gzip' in self.headers.get('Accept-Encoding', '').lower()
+
+    def stream_updates(self, city: str, snapshot: Dict[str, Any], updates: queue.Queue):
+        """Server-sent events: the current snapshot, then every new one.
+
+        Each event goes out as one HTTP chunk. With gzip the stream shares one
+        compressor that is flushed per event, so later snapshots compress
+        against earlier ones.
+        """
+        compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if self.accepts_gzip() else None
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Transfer-Encoding', 'chunked')
+        if compressor:
+            self.send_header('Content-Encoding', 'gzip')
+        self.end_headers()
+        self.close_connection = True
+
+        def send_chunk(data: bytes):
+            if compressor:
+                data = compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH)
+            self.wfile.write(f"{len(data):x}\r\n".encode('ascii') + data + b'\r\n')
+            self.wfile.flush()
+
+        try:
+            while True:
+                # The refresh this request triggered may have queued the same
+                # snapshot already; send only the newest one
+                while True:
+                    try:
+                        queued = updates.get_nowait()
+                    except queue.Empty:
+                        break
+                    if queued['updated'] > snapshot['updated']:
+                        snapshot = queued
+                send_chunk(b'event: update\ndata: ' + snapshot['payload'] + b'\n\n')
+                while True:
+                    try:
+                        snapshot = updates.get(timeout=Config.GATEWAY_KEEPALIVE)
+                        break
+                    except queue.Empty:
+                        send_chunk(b': keepalive\n\n')
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            self.gateway.unsubscribe(city, updates)
+
+    def send_json(self, status: int, data: Dict[str, Any]):
+        self.send_body(status, 'application/json', json.dumps(data).encode('utf-8'))
+
+    def send_body(self, status: int, content_type: str, body: bytes, encoding: str = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        if encoding:
+            self.send_header('Content-Encoding', encoding)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def run_gateway(host: str = None, port: int = None):
+    gateway = WeatherGateway()
+    GatewayRequestHandler.gateway = gateway
+    server = ThreadingHTTPServer((host or Config.GATEWAY_HOST, port or Config.GATEWAY_PORT),
+                                 GatewayRequestHandler)
+    server.daemon_threads = True
+
+    threading.Thread(target=gateway.run_scheduler, daemon=True).start()
+
+    print(f"Weather gateway listening on http://{server.server_address[0]}:{server.server_address[1]}")
+    print("Press Ctrl+C to stop the gateway")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nWeather gateway stopped")
+    finally:
+        gateway.stop()
+        server.server_close()
+
+if __name__ == "__main__":
+    run_gateway()
\ No newline at end of file